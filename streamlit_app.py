@@ -1,9 +1,52 @@
 import streamlit as st
-import pandas as pd
+import codecs
+import io
 import tempfile
 import os
+import shutil
 from translation_checker import load_pairs, load_glossary, run_checks
 
+# Above this many segments the QA checks are spread over worker processes
+PARALLEL_MIN_SEGMENTS = 50_000
+
+# Parsed uploads are only reused by reruns of the session that uploaded them,
+# so keep a handful and let them expire instead of holding every one forever
+UPLOAD_CACHE_ENTRIES = 8
+UPLOAD_CACHE_TTL = "1h"
+
+
+def save_upload(uploaded_file, directory: str) -> str:
+    """Stream an uploaded file to disk in 1 MiB chunks and return its path."""
+    path = os.path.join(directory, uploaded_file.name)
+    with open(path, "wb") as f:
+        shutil.copyfileobj(uploaded_file, f, 1 << 20)
+    return path
+
+
+@st.cache_data(show_spinner=False, max_entries=UPLOAD_CACHE_ENTRIES, ttl=UPLOAD_CACHE_TTL)
+def load_pairs_cached(_src_path: str, _tgt_path: str, src_id: str, tgt_id: str):
+    # Keyed on the upload ids only: temp paths change on every rerun
+    return load_pairs(_src_path, _tgt_path)
+
+
+@st.cache_data(show_spinner=False, max_entries=UPLOAD_CACHE_ENTRIES, ttl=UPLOAD_CACHE_TTL)
+def load_glossary_cached(_path: str, file_id: str):
+    return load_glossary(_path)
+
+
+def issues_to_csv(df) -> bytes:
+    """Encode the issues table as CSV with a UTF-8 BOM (for Excel), via pyarrow when available."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pv
+    except ImportError:
+        return df.to_csv(index=False).encode("utf-8-sig")
+    buf = io.BytesIO()
+    buf.write(codecs.BOM_UTF8)
+    pv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue()
+
+
 st.set_page_config(page_title="Translation QA Checker", layout="wide")
 
 st.title("📝 Translation QA Checker")
@@ -24,24 +67,17 @@ glossary_file = st.file_uploader("Upload Glossary (optional, CSV with columns: s
 if src_file and tgt_file:
     with tempfile.TemporaryDirectory() as tmpdir:
         # Save files temporarily
-        src_path = os.path.join(tmpdir, src_file.name)
-        tgt_path = os.path.join(tmpdir, tgt_file.name)
-
-        with open(src_path, "wb") as f:
-            f.write(src_file.read())
-        with open(tgt_path, "wb") as f:
-            f.write(tgt_file.read())
+        src_path = save_upload(src_file, tmpdir)
+        tgt_path = save_upload(tgt_file, tmpdir)
 
         glossary = None
         if glossary_file:
-            gloss_path = os.path.join(tmpdir, glossary_file.name)
-            with open(gloss_path, "wb") as f:
-                f.write(glossary_file.read())
-            glossary = load_glossary(gloss_path)
+            gloss_path = save_upload(glossary_file, tmpdir)
+            glossary = load_glossary_cached(gloss_path, glossary_file.file_id)
 
         # --- Align Source & Target ---
         try:
-            combined = load_pairs(src_path, tgt_path)
+            combined = load_pairs_cached(src_path, tgt_path, src_file.file_id, tgt_file.file_id)
         except Exception as e:
             st.error(f"Error reading files: {e}")
             st.stop()
@@ -50,19 +86,22 @@ if src_file and tgt_file:
 
         # --- Run QA Checks ---
         if st.button("Run QA Checks"):
-            issues, stats = run_checks(combined, glossary=glossary)
+            issues, stats = run_checks(combined, glossary=glossary,
+                                       parallel=len(combined) >= PARALLEL_MIN_SEGMENTS)
 
             st.subheader("QA Summary")
             st.write(f"Total Segments: {stats['total']}")
             st.write(f"Issues Found: {stats['issues']}")
 
             if issues:
+                import pandas as pd
+
                 st.subheader("Detailed Issues")
                 df = pd.DataFrame([i.to_dict() for i in issues])
                 st.dataframe(df, use_container_width=True)
 
                 # Download CSV
-                csv = df.to_csv(index=False).encode("utf-8-sig")
+                csv = issues_to_csv(df)
                 st.download_button(
                     label="Download Issues as CSV",
                     data=csv,
@@ -0,0 +1,78 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import translation_checker as tc
+
+GLOSSARY = {
+    "": "Ziel",
+    "Save": "Speichern",
+    "cat": "Katze",
+    "New York": "NY",
+    "York": "Y",
+    "York City": "YC",
+    ".NET": "NET",
+    "日本": "Japan",
+    "12": "zwölf",
+}
+ATOMS = ["Save", "Saved", "concatenate", "New York", "York City", ".NET", "日本",
+         "12", "é", " ", "-", "Speichern", "NY", "Katze", "Ziel"]
+
+
+def _segments(n, max_atoms):
+    rnd = random.Random(0)
+    return [("".join(rnd.choice(ATOMS) for _ in range(rnd.randint(0, max_atoms))),
+             "".join(rnd.choice(ATOMS) for _ in range(rnd.randint(0, max_atoms))))
+            for _ in range(n)]
+
+
+def _backend(name):
+    if name == "automaton":
+        pytest.importorskip("ahocorasick")
+        return tc._automaton_finder
+    if name == "hyperscan":
+        pytest.importorskip("hyperscan")
+        return tc._hyperscan_finder
+    return tc._word_index_finder
+
+
+@pytest.mark.parametrize("backend", ["automaton", "hyperscan", "word_index"])
+@pytest.mark.parametrize("glossary", [GLOSSARY, {k: v for k, v in GLOSSARY.items() if k}, {"": "Ziel"}])
+@pytest.mark.parametrize("max_atoms", [6, 400])
+def test_matcher_agrees_with_check_glossary(monkeypatch, backend, glossary, max_atoms):
+    entries = tuple(glossary.items())
+    find = tc._term_finder(entries, finders=(_backend(backend),))
+    # Exercise the index itself, not only its fall back to scanning every term
+    monkeypatch.setattr(tc, "_INDEX_PROBE_COST", 0)
+
+    for src, tgt in _segments(100, max_atoms):
+        expected = tc.check_glossary("1", src, tgt, glossary)
+        got = tc._glossary_mismatch(src, tgt, entries, sorted(find(src)))
+        assert got == (expected.details if expected else None), (src, tgt)
+
+
+def test_load_glossary_skips_blank_cells(tmp_path):
+    path = tmp_path / "glossary.csv"
+    path.write_text("source,target\nSave,Speichern\n  ,Ziel\nOpen,  \n", encoding="utf-8")
+    assert tc.load_glossary(str(path)) == {"Save": "Speichern"}
+
+
+@pytest.mark.parametrize("backend", ["automaton", "hyperscan", "word_index"])
+def test_matcher_is_safe_to_share_between_threads(backend):
+    # Streamlit sessions run in threads and share the memoised checker
+    rnd = random.Random(1)
+    glossary = {"".join(rnd.choice("abcdefgh") for _ in range(rnd.randint(3, 8))): "x"
+                for _ in range(2000)}
+    entries = tuple(glossary.items())
+    find = tc._term_finder(entries, finders=(_backend(backend),))
+    # Long, match-dense segments keep scans overlapping across threads
+    segments = ["".join(rnd.choice("abcdefgh ") for _ in range(20000)) for _ in range(4)]
+    expected = [find(src) for src in segments]
+
+    def work():
+        return [find(src) for _ in range(5) for src in segments]
+
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        results = [f.result() for f in [ex.submit(work) for _ in range(8)]]
+    assert all(r == expected * 5 for r in results)
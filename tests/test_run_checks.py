@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+import translation_checker as tc
+
+GLOSSARY = {"Save": "Speichern", "cat": "Katze"}
+PAIRS = [
+    {"id": "1", "source": "Save {0} files", "target": "Speichern {0} Dateien"},
+    {"id": "2", "source": "Save 3 cats", "target": "4 Katzen sichern"},
+    {"id": "3", "source": "<b>cat</b>", "target": "Katze"},
+    {"id": "4", "source": "Open", "target": ""},
+    {"id": "5", "source": "A short one", "target": "Ein sehr, sehr, sehr langer Satz dazu"},
+]
+
+
+ATOMS = ["Save", "cat", "Katze", "Speichern", "{0}", "%s", "3", "4.5", "<b>", "</b>",
+         "<br/>", "Open", " ", "word", ""]
+
+
+def _dicts(issues):
+    return [i.to_dict() for i in issues]
+
+
+def _random_pairs(n):
+    rnd = random.Random(0)
+    return [{"id": str(i),
+             "source": "".join(rnd.choice(ATOMS) for _ in range(rnd.randint(0, 6))),
+             "target": "".join(rnd.choice(ATOMS) for _ in range(rnd.randint(0, 6)))}
+            for i in range(n)]
+
+
+def _expected(pairs, glossary, limits=(0.5, 3.0)):
+    # the checks one pair at a time, in the order run_checks reports them
+    issues = []
+    for p in pairs:
+        uid, src, tgt = p["id"], p["source"], p["target"]
+        if src and tgt and not limits[0] <= len(tgt) / len(src) <= limits[1]:
+            issues.append(tc.QAIssue(uid, "LENGTH_RATIO", f"Ratio={len(tgt) / len(src):.2f}", src, tgt))
+        found = [check(uid, src, tgt) for check in
+                 (tc.check_placeholders, tc.check_numbers, tc.check_tags, tc.check_empty)]
+        if glossary:
+            found.append(tc.check_glossary(uid, src, tgt, glossary))
+        issues.extend(issue for issue in found if issue)
+    return issues
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+@pytest.mark.parametrize("duplicated", [False, True])
+def test_run_checks_agrees_with_public_checks(monkeypatch, parallel, duplicated):
+    pairs = _random_pairs(300)
+    if duplicated:
+        # repeat texts under new ids, shuffled in among the originals
+        rnd = random.Random(1)
+        pairs += [dict(p, id=f"dup-{p['id']}") for p in rnd.sample(pairs, 150)]
+        rnd.shuffle(pairs)
+    if parallel:
+        monkeypatch.setattr(tc, "_usable_cpus", lambda: 4)
+
+    issues, stats = tc.run_checks(pairs, GLOSSARY, parallel=parallel)
+    expected = _expected(pairs, GLOSSARY)
+    assert _dicts(issues) == _dicts(expected)
+    assert stats == {"total": len(pairs), "issues": len(expected)}
+
+
+def test_cache_is_reused_across_length_ratio_limits():
+    cache = {}
+    for limits in [(0.5, 3.0), (0.9, 1.1), (0.5, 3.0)]:
+        cached, _ = tc.run_checks(PAIRS, GLOSSARY, length_ratio_limits=limits, cache=cache)
+        uncached, _ = tc.run_checks(PAIRS, GLOSSARY, length_ratio_limits=limits)
+        assert _dicts(cached) == _dicts(uncached)
+
+    # a different glossary must not be served the first glossary's results
+    cached, _ = tc.run_checks(PAIRS, {"Open": "Öffnen"}, cache=cache)
+    uncached, _ = tc.run_checks(PAIRS, {"Open": "Öffnen"})
+    assert _dicts(cached) == _dicts(uncached)
+
+
+def test_empty_pairs_still_get_glossary_check():
+    issues, _ = tc.run_checks([{"id": "1", "source": "", "target": ""}], {"": "Ziel"})
+    assert [(i.uid, i.issue_type) for i in issues] == [("1", "GLOSSARY_MISMATCH")]
+    assert _dicts(issues) == _dicts([tc.check_glossary("1", "", "", {"": "Ziel"})])
@@ -1,7 +1,25 @@
 import csv
+import functools
+import multiprocessing
+import os
 import re
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Dict, Tuple, Optional
+from itertools import zip_longest
+from typing import List, Dict, Tuple, Optional, Callable, Iterable, Set
+
+_PLACEHOLDER_RE = re.compile(r"%\w+|\{[^}]+\}|\$\w+")
+_NUM_RE = re.compile(r"\d+")
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"\w+")
+
+# Glossary word index key length, and its cost model in units of one
+# character of substring search: per term scanned, per character probed
+_INDEX_KEY_LEN = 3
+_TERM_SCAN_OVERHEAD = 250
+_INDEX_PROBE_COST = 1200
 
 @dataclass
 class QAIssue:
@@ -27,26 +45,30 @@ def extract_segments(file_path: str, is_source: bool = True) -> List[str]:
 
     if file_path.endswith(".xlsx"):
         import pandas as pd
-        df = pd.read_excel(file_path)
+        df = pd.read_excel(file_path, dtype=str).fillna("")
         col = "source" if is_source else "target"
         if col in df.columns:
-            segments = df[col].astype(str).fillna("").tolist()
+            segments = df[col].tolist()
         else:
             # fallback: take first column
-            segments = df.iloc[:, 0].astype(str).fillna("").tolist()
+            segments = df.iloc[:, 0].tolist()
 
     elif file_path.endswith(".docx"):
         from docx import Document
         doc = Document(file_path)
-        segments = [para.text for para in doc.paragraphs if para.text.strip()]
+        texts = (para.text for para in doc.paragraphs)
+        segments = [text for text in texts if text.strip()]
 
     elif file_path.endswith(".pptx"):
         from pptx import Presentation
         prs = Presentation(file_path)
         for slide in prs.slides:
             for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text.strip():
-                    segments.append(shape.text)
+                if not shape.has_text_frame:
+                    continue
+                text = shape.text_frame.text
+                if text.strip():
+                    segments.append(text)
 
     elif file_path.endswith(".pdf"):
         if not is_source:
@@ -72,104 +94,356 @@ def load_pairs(src_file: str, tgt_file: Optional[str] = None) -> List[Dict[str,
     src_segments = extract_segments(src_file, is_source=True)
     tgt_segments = extract_segments(tgt_file, is_source=False) if tgt_file else []
 
-    pairs = []
-    max_len = max(len(src_segments), len(tgt_segments))
+    return [
+        {"id": str(i), "source": src, "target": tgt}
+        for i, (src, tgt) in enumerate(zip_longest(src_segments, tgt_segments, fillvalue=""), start=1)
+    ]
 
-    for i in range(max_len):
-        pairs.append({
-            "id": str(i + 1),
-            "source": src_segments[i] if i < len(src_segments) else "",
-            "target": tgt_segments[i] if i < len(tgt_segments) else "",
-        })
 
-    return pairs
+def _read_glossary_arrow(file_path: str) -> Optional[List[Tuple[Optional[str], Optional[str]]]]:
+    """
+    Read (source, target) rows with pyarrow's CSV parser.
+    Returns None if pyarrow is not installed or can't parse the file.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pv
+    except ImportError:
+        return None
+    names = ("source", "Source", "target", "Target")
+    try:
+        table = pv.read_csv(
+            file_path,
+            parse_options=pv.ParseOptions(newlines_in_values=True),
+            convert_options=pv.ConvertOptions(column_types={n: pa.string() for n in names}),
+        )
+    except pa.ArrowInvalid:
+        return None
+
+    def column(*candidates: str) -> List[Optional[str]]:
+        cols = [table.column(n).to_pylist() for n in candidates if n in table.column_names]
+        if not cols:
+            return [None] * table.num_rows
+        # same precedence as row.get("source") or row.get("Source")
+        return [next((v for v in values if v), None) for values in zip(*cols)]
+
+    return list(zip(column("source", "Source"), column("target", "Target")))
 
 
 def load_glossary(file_path: str) -> Dict[str, str]:
+    rows = _read_glossary_arrow(file_path)
+    if rows is None:
+        with open(file_path, encoding="utf-8-sig") as f:
+            rows = [(row.get("source") or row.get("Source"), row.get("target") or row.get("Target"))
+                    for row in csv.DictReader(f)]
+
     glossary = {}
-    with open(file_path, encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            src = row.get("source") or row.get("Source")
-            tgt = row.get("target") or row.get("Target")
-            if src and tgt:
-                glossary[src.strip()] = tgt.strip()
+    for src, tgt in rows:
+        src, tgt = (src or "").strip(), (tgt or "").strip()
+        if src and tgt:
+            glossary[src] = tgt
     return glossary
 
 
-# --- QA Checks (same as before) ---
-def check_placeholders(uid: str, src: str, tgt: str) -> Optional[QAIssue]:
-    pattern = r"%\w+|\{[^}]+\}|\$\w+"
-    src_tokens = re.findall(pattern, src)
-    tgt_tokens = re.findall(pattern, tgt)
-    if sorted(src_tokens) != sorted(tgt_tokens):
-        return QAIssue(uid, "PLACEHOLDER_MISMATCH",
-                       f"Source={src_tokens}, Target={tgt_tokens}",
-                       src, tgt)
+# --- QA Checks ---
+def _tokens_differ(src_tokens: List[str], tgt_tokens: List[str]) -> bool:
+    """Order-insensitive comparison; sorting is cheaper than Counter for a handful of tokens."""
+    if len(src_tokens) != len(tgt_tokens):
+        return True
+    if len(src_tokens) < 4:
+        return sorted(src_tokens) != sorted(tgt_tokens)
+    return Counter(src_tokens) != Counter(tgt_tokens)
+
+
+# Most segments carry no markup, so the placeholder and tag patterns
+# only run when their leading characters are present at all.
+def _placeholders(s: str) -> List[str]:
+    return _PLACEHOLDER_RE.findall(s) if ("%" in s or "{" in s or "$" in s) else []
+
+
+def _numbers(s: str) -> List[str]:
+    return _NUM_RE.findall(s)
+
+
+def _tags(s: str) -> List[str]:
+    return _TAG_RE.findall(s) if "<" in s else []
+
+
+# (issue type, token extractor) for each token check, in report order
+_TOKEN_CHECKS = (
+    ("PLACEHOLDER_MISMATCH", _placeholders),
+    ("NUM_MISMATCH", _numbers),
+    ("TAG_MISMATCH", _tags),
+)
+
+
+def _token_mismatch(extract: Callable[[str], List[str]], src: str, tgt: str) -> Optional[str]:
+    src_tokens, tgt_tokens = extract(src), extract(tgt)
+    if _tokens_differ(src_tokens, tgt_tokens):
+        return f"Source={src_tokens}, Target={tgt_tokens}"
     return None
 
 
-def check_numbers(uid: str, src: str, tgt: str) -> Optional[QAIssue]:
-    nums_src = re.findall(r"\d+", src)
-    nums_tgt = re.findall(r"\d+", tgt)
-    if sorted(nums_src) != sorted(nums_tgt):
-        return QAIssue(uid, "NUM_MISMATCH",
-                       f"Source={nums_src}, Target={nums_tgt}",
-                       src, tgt)
+def _target_empty(src: str, tgt: str) -> bool:
+    return bool(src.strip()) and not tgt.strip()
+
+
+def _glossary_mismatch(src: str, tgt: str, entries: Tuple[Tuple[str, str], ...],
+                       ranks: Iterable[int]) -> Optional[str]:
+    # ranks must be ascending: the first mismatching term in glossary order wins
+    for rank in ranks:
+        s_term, t_term = entries[rank]
+        if s_term in src and t_term not in tgt:
+            return f"Expected '{s_term}' -> '{t_term}'"
     return None
 
 
+def check_placeholders(uid: str, src: str, tgt: str) -> Optional[QAIssue]:
+    details = _token_mismatch(_placeholders, src, tgt)
+    return QAIssue(uid, "PLACEHOLDER_MISMATCH", details, src, tgt) if details else None
+
+
+def check_numbers(uid: str, src: str, tgt: str) -> Optional[QAIssue]:
+    details = _token_mismatch(_numbers, src, tgt)
+    return QAIssue(uid, "NUM_MISMATCH", details, src, tgt) if details else None
+
+
 def check_tags(uid: str, src: str, tgt: str) -> Optional[QAIssue]:
-    tags_src = re.findall(r"<[^>]+>", src)
-    tags_tgt = re.findall(r"<[^>]+>", tgt)
-    if sorted(tags_src) != sorted(tags_tgt):
-        return QAIssue(uid, "TAG_MISMATCH",
-                       f"Source={tags_src}, Target={tags_tgt}",
-                       src, tgt)
-    return None
+    details = _token_mismatch(_tags, src, tgt)
+    return QAIssue(uid, "TAG_MISMATCH", details, src, tgt) if details else None
 
 
 def check_empty(uid: str, src: str, tgt: str) -> Optional[QAIssue]:
-    if src.strip() and not tgt.strip():
+    if _target_empty(src, tgt):
         return QAIssue(uid, "EMPTY_TARGET", "Target is empty", src, tgt)
     return None
 
 
 def check_glossary(uid: str, src: str, tgt: str, glossary: Dict[str, str]) -> Optional[QAIssue]:
-    for s_term, t_term in glossary.items():
-        if s_term in src and t_term not in tgt:
-            return QAIssue(uid, "GLOSSARY_MISMATCH",
-                           f"Expected '{s_term}' -> '{t_term}'",
-                           src, tgt)
-    return None
+    entries = tuple(glossary.items())
+    details = _glossary_mismatch(src, tgt, entries, range(len(entries)))
+    return QAIssue(uid, "GLOSSARY_MISMATCH", details, src, tgt) if details else None
+
+
+def _word_index_finder(entries: Tuple[Tuple[str, str], ...]) -> Callable[[str], Set[int]]:
+    """
+    Index glossary entries by the first _INDEX_KEY_LEN characters of the
+    first run of word characters in the term. That run always falls inside
+    one word of a segment containing the term, so probing each position of
+    the segment's words finds every candidate.
+    """
+    by_key = defaultdict(list)
+    unkeyed = []
+    for rank, (s_term, _) in enumerate(entries):
+        key = _WORD_RE.search(s_term)
+        if key:
+            by_key[key.group()[:_INDEX_KEY_LEN]].append(rank)
+        else:
+            unkeyed.append(rank)
+    key_lens = sorted({len(key) for key in by_key})
+    every = range(len(entries))
+
+    def find(src: str) -> Set[int]:
+        # Probing costs a few dict lookups per character, scanning costs one
+        # substring search per term; with few terms scanning them all wins
+        n = len(src)
+        if len(entries) * (n + _TERM_SCAN_OVERHEAD) < n * _INDEX_PROBE_COST * len(key_lens):
+            return set(every)
+        ranks = set(unkeyed)
+        get = by_key.get
+        for word in set(_WORD_RE.findall(src)):
+            for i in range(len(word)):
+                for k in key_lens:
+                    hit = get(word[i:i + k])
+                    if hit:
+                        ranks.update(hit)
+        return ranks
+
+    return find
+
+
+def _automaton_finder(entries: Tuple[Tuple[str, str], ...]) -> Callable[[str], Set[int]]:
+    """Aho-Corasick automaton over the non-empty terms (needs pyahocorasick)."""
+    import ahocorasick
+
+    automaton = ahocorasick.Automaton()
+    for rank, (s_term, _) in enumerate(entries):
+        if s_term:
+            automaton.add_word(s_term, rank)
+    automaton.make_automaton()
+    return lambda src: {rank for _, rank in automaton.iter(src)}
+
+
+def _hyperscan_finder(entries: Tuple[Tuple[str, str], ...]) -> Callable[[str], Set[int]]:
+    """Hyperscan literal database over the non-empty terms (needs hyperscan)."""
+    import hyperscan
+
+    ranks = [rank for rank, (s_term, _) in enumerate(entries) if s_term]
+    db = hyperscan.Database()
+    db.compile(expressions=[entries[rank][0].encode("utf-8") for rank in ranks],
+               ids=ranks, elements=len(ranks),
+               flags=hyperscan.HS_FLAG_SINGLEMATCH, literal=True)
+
+    # The checker is shared process-wide (Streamlit runs sessions in threads)
+    # and a hyperscan scratch space can only serve one scan at a time
+    local = threading.local()
+
+    def find(src: str) -> Set[int]:
+        scratch = getattr(local, "scratch", None)
+        if scratch is None:
+            scratch = local.scratch = hyperscan.Scratch(db)
+        found = set()
+        db.scan(src.encode("utf-8"), match_event_handler=lambda rank, *_: found.add(rank),
+                scratch=scratch)
+        return found
+
+    return find
+
+
+# Term matchers in order of preference; the word index always works
+_TERM_FINDERS = (_automaton_finder, _hyperscan_finder, _word_index_finder)
+
+
+def _term_finder(entries: Tuple[Tuple[str, str], ...],
+                 finders=_TERM_FINDERS) -> Callable[[str], Set[int]]:
+    """
+    Build the first matcher for the glossary source terms whose library is
+    installed, returning the ranks of the entries that may occur in a segment.
+    """
+    # An empty term is in every segment (as `"" in src` is for check_glossary).
+    # The matchers can't index it, so such entries are always candidates.
+    always = frozenset(rank for rank, (s_term, _) in enumerate(entries) if not s_term)
+    if len(always) == len(entries):
+        return lambda src: set(always)
+
+    for build in finders:
+        try:
+            find = build(entries)
+        except ImportError:
+            continue
+        return (lambda src: always.union(find(src))) if always else find
+
+    raise ImportError("no glossary matcher available")
+
+
+@functools.lru_cache(maxsize=8)
+def _glossary_checker(entries: Tuple[Tuple[str, str], ...]) -> Callable[[str, str], Optional[str]]:
+    """Return a function giving the GLOSSARY_MISMATCH details for a pair, or None."""
+    find_terms = _term_finder(entries)
+
+    def check(src: str, tgt: str) -> Optional[str]:
+        return _glossary_mismatch(src, tgt, entries, sorted(find_terms(src)))
+
+    return check
+
+
+def _check_pair(src: str, tgt: str,
+                glossary_check: Optional[Callable[[str, str], Optional[str]]]) -> Tuple[Tuple[str, str], ...]:
+    """
+    Run the checks that don't depend on runtime thresholds on one pair and
+    return (issue_type, details) tuples.
+    """
+    found = []
+    # Identical text can't disagree on tokens or have an empty target,
+    # but it can still miss a glossary translation
+    if src != tgt:
+        # Same logic as check_placeholders/check_numbers/check_tags/check_empty
+        for issue_type, extract in _TOKEN_CHECKS:
+            details = _token_mismatch(extract, src, tgt)
+            if details:
+                found.append((issue_type, details))
+
+        if _target_empty(src, tgt):
+            found.append(("EMPTY_TARGET", "Target is empty"))
+
+    if glossary_check is not None:
+        details = glossary_check(src, tgt)
+        if details:
+            found.append(("GLOSSARY_MISMATCH", details))
+    return tuple(found)
+
+
+def _usable_cpus() -> int:
+    """CPUs this process may run on, honouring affinity masks where the OS reports them."""
+    if hasattr(os, "process_cpu_count"):  # Python 3.13+
+        return os.process_cpu_count() or 1
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _check_chunk(pairs: List[Tuple[str, str]],
+                 glossary_entries: Tuple[Tuple[str, str], ...]) -> List[Tuple[Tuple[str, str], ...]]:
+    """Return the (issue_type, details) tuples found for each (source, target) pair."""
+    glossary_check = _glossary_checker(glossary_entries) if glossary_entries else None
+    return [_check_pair(src, tgt, glossary_check) for src, tgt in pairs]
 
 
 def run_checks(pairs: List[Dict[str, str]],
                glossary: Optional[Dict[str, str]] = None,
                config: Optional[Dict] = None,
-               length_ratio_limits: Tuple[float, float] = (0.5, 3.0)) -> Tuple[List[QAIssue], Dict]:
-    issues: List[QAIssue] = []
+               length_ratio_limits: Tuple[float, float] = (0.5, 3.0),
+               parallel: bool = False,
+               cache: Optional[Dict] = None) -> Tuple[List[QAIssue], Dict]:
+    """
+    Run all QA checks over the aligned pairs.
+    Each distinct (source, target) text is checked once and its issues are
+    reported for every id that shares it. With parallel=True the distinct
+    pairs are split into one chunk per CPU and checked in worker processes;
+    issues come back in input order either way.
+    Pass the same dict as `cache` to later calls to skip re-checking pairs
+    already seen (e.g. re-runs with other length ratio limits); the caller
+    owns it and decides how long it lives.
+    """
     stats = {"total": len(pairs), "issues": 0}
+    entries = tuple(glossary.items()) if glossary else ()
+
+    texts = [(p.get("source", ""), p.get("target", "")) for p in pairs]
+    unique = list(dict.fromkeys(texts))
 
-    for p in pairs:
-        uid, src, tgt = p.get("id"), p.get("source", ""), p.get("target", "")
+    if cache is None:
+        todo = unique
+    else:
+        # Results depend on the glossary, so each glossary gets its own table
+        per_glossary = cache.setdefault(entries, {})
+        todo = [text for text in unique if text not in per_glossary]
+
+    workers = _usable_cpus()
+    if parallel and workers > 1 and len(todo) > workers:
+        size = -(-len(todo) // workers)
+        chunks = [todo[i:i + size] for i in range(0, len(todo), size)]
+        # spawn, not fork: callers such as Streamlit run threads, and forking
+        # a threaded process can deadlock the children
+        with ProcessPoolExecutor(max_workers=len(chunks),
+                                 mp_context=multiprocessing.get_context("spawn")) as ex:
+            results = ex.map(_check_chunk, chunks, [entries] * len(chunks))
+            found = [r for chunk_results in results for r in chunk_results]
+    else:
+        found = _check_chunk(todo, entries)
+    found_by_text = dict(zip(todo, found))
+
+    if cache is not None:
+        per_glossary.update(found_by_text)
+        for text in unique:
+            if text not in found_by_text:
+                found_by_text[text] = per_glossary[text]
+
+    lo, hi = length_ratio_limits
+    issues: List[QAIssue] = []
+    # bound once; this loop runs per segment
+    add = issues.append
+
+    for p, (src, tgt) in zip(pairs, texts):
+        uid = p.get("id")
 
         # Length ratio check
         if src and tgt:
-            ratio = len(tgt) / max(1, len(src))
-            if not (length_ratio_limits[0] <= ratio <= length_ratio_limits[1]):
-                issues.append(QAIssue(uid, "LENGTH_RATIO",
-                                      f"Ratio={ratio:.2f}", src, tgt))
-
-        for check in [check_placeholders, check_numbers, check_tags, check_empty]:
-            issue = check(uid, src, tgt)
-            if issue:
-                issues.append(issue)
-
-        if glossary:
-            issue = check_glossary(uid, src, tgt, glossary)
-            if issue:
-                issues.append(issue)
+            ratio = len(tgt) / len(src)
+            if not (lo <= ratio <= hi):
+                add(QAIssue(uid, "LENGTH_RATIO", f"Ratio={ratio:.2f}", src, tgt))
+
+        for issue_type, details in found_by_text[src, tgt]:
+            add(QAIssue(uid, issue_type, details, src, tgt))
 
     stats["issues"] = len(issues)
     return issues, stats